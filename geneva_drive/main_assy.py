@@ -1,5 +1,6 @@
 # %%
 import math
+import numpy as np
 from cadbuildr.foundation import (
     show,
     Sketch,
@@ -20,7 +21,9 @@ BASE_WIDTH = 50
 BASE_LENGTH = 100
 PIN_DISTANCE = BASE_LENGTH * 0.5
 PIN_DIAMETER = 4
-DISK_DIAMETER = 2 * PIN_DISTANCE / math.sqrt(2) + PIN_DIAMETER
+# Distance of the sliding pin to the disk center, the pins sit 45 degrees apart
+_PIN_OVER_SQRT2 = PIN_DISTANCE / math.sqrt(2)
+DISK_DIAMETER = 2 * _PIN_OVER_SQRT2 + PIN_DIAMETER
 SLIDING_CIRCLE_DIAMETER = DISK_DIAMETER * 0.8
 BEARING_HEIGHT = 6
 BEARING_DIAMETER = 19
@@ -84,13 +87,13 @@ class RoundedRectangularPlateWithPins(Part):
 
     def __init__(self):
         super().__init__()
-        self.create_plate()
-        self.create_pins()
+        sketch = Sketch(self.xy())
+        self.create_plate(sketch)
+        self.create_pins(sketch)
         self.paint("plywood")
 
-    def create_plate(self):
+    def create_plate(self, sketch):
         # Create the rectangular plate with rounded corners by using RoundedCornerRectangle
-        sketch = Sketch(self.xy())
         center_point = sketch.origin
         plate = RoundedCornerRectangle.from_center_and_sides(
             center_point, self.LENGTH, self.WIDTH, self.FILLET_RADIUS
@@ -100,47 +103,45 @@ class RoundedRectangularPlateWithPins(Part):
         )  # Extrude plate to 5 mm thickness
         self.add_operation(extrusion)
 
-    def create_pins(self):
+    def create_pins(self, sketch):
         # Create the two holes for the bearings by cutting extrusions
         # plane = self.pf.get_parallel_plane(self.xy(), self.PLATE_THICKNESS)
-        sketch = Sketch(self.xy())
 
         # Calculate positions of the two holes
         pin1_center = Point(sketch, -self.PIN_DISTANCE / 2, 0)
         pin2_center = Point(sketch, self.PIN_DISTANCE / 2, 0)
 
-        # Add the first pin lip
-        circle1 = Circle(pin1_center, self.LIP_DIAMETER / 2)
-        pin1 = Extrusion(
-            circle1, start=self.PLATE_THICKNESS, end=CIRCLES_PART_HEIGHT, cut=False
-        )  # Cutting through the plate
-        self.add_operation(pin1)
-        # Add the first pin
-        pin_circle = Circle(pin1_center, self.PIN_DIAMETER / 2)
-        pin = Extrusion(
-            pin_circle,
-            start=CIRCLES_PART_HEIGHT - BEARING_PLATE_OFFSET,
-            end=CIRCLES_PART_HEIGHT + BEARING_HEIGHT - BEARING_PLATE_OFFSET,
+        # Add both pin lips, the second one is taller as the cross sits higher
+        lips = [
+            Circle(pin1_center, self.LIP_DIAMETER / 2),
+            Circle(pin2_center, self.LIP_DIAMETER / 2),
+        ]
+        lip_extrusion = Extrusion(
+            lips,
+            start=self.PLATE_THICKNESS,
+            end=[CIRCLES_PART_HEIGHT, CROSS_PART_HEIGHT],
             cut=False,
         )
-        self.add_operation(pin)
+        self.add_operation(lip_extrusion)
 
-        # Add the second pin lip
-        circle2 = Circle(pin2_center, self.LIP_DIAMETER / 2)
-        pin2 = Extrusion(
-            circle2, start=self.PLATE_THICKNESS, end=CROSS_PART_HEIGHT, cut=False
-        )  # Cutting through the plate
-        self.add_operation(pin2)
-
-        # Add the second pin
-        pin_circle = Circle(pin2_center, self.PIN_DIAMETER / 2)
-        pin = Extrusion(
-            pin_circle,
-            start=CROSS_PART_HEIGHT - BEARING_PLATE_OFFSET,
-            end=CROSS_PART_HEIGHT + BEARING_HEIGHT - BEARING_PLATE_OFFSET,
+        # Add both pins, going through the bearings
+        pins = [
+            Circle(pin1_center, self.PIN_DIAMETER / 2),
+            Circle(pin2_center, self.PIN_DIAMETER / 2),
+        ]
+        pin_extrusion = Extrusion(
+            pins,
+            start=[
+                CIRCLES_PART_HEIGHT - BEARING_PLATE_OFFSET,
+                CROSS_PART_HEIGHT - BEARING_PLATE_OFFSET,
+            ],
+            end=[
+                CIRCLES_PART_HEIGHT + BEARING_HEIGHT - BEARING_PLATE_OFFSET,
+                CROSS_PART_HEIGHT + BEARING_HEIGHT - BEARING_PLATE_OFFSET,
+            ],
             cut=False,
         )
-        self.add_operation(pin)
+        self.add_operation(pin_extrusion)
 
 
 class PlateWithBearingsAssembly(Assembly):
@@ -157,15 +158,17 @@ class PlateWithBearingsAssembly(Assembly):
         # Create the first bearing and position it at the first hole
         bearing1 = BallBearing626D()
         bearing1_tf = TFHelper()
-        bearing1_tf.translate_x(-PIN_DISTANCE / 2)
-        bearing1_tf.translate_z(CIRCLES_PART_HEIGHT - BEARING_PLATE_OFFSET)
+        bearing1_tf.translate(
+            [-PIN_DISTANCE / 2, 0, CIRCLES_PART_HEIGHT - BEARING_PLATE_OFFSET]
+        )
         self.add_component(bearing1, bearing1_tf.get_tf())  # Add first bearing
 
         # Create the second bearing and position it at the second hole
         bearing2 = BallBearing626D()
         bearing2_tf = TFHelper()
-        bearing2_tf.translate_x(PIN_DISTANCE / 2)
-        bearing2_tf.translate_z(CROSS_PART_HEIGHT - BEARING_PLATE_OFFSET)
+        bearing2_tf.translate(
+            [PIN_DISTANCE / 2, 0, CROSS_PART_HEIGHT - BEARING_PLATE_OFFSET]
+        )
         self.add_component(bearing2, bearing2_tf.get_tf())  # Add second bearing
 
 
@@ -182,42 +185,48 @@ class GenevaDiskAndHoles(Part):
     def __init__(self):
         super().__init__()
         self.create_disk()
-        self.add_circle_cut()
+        # Planes on top of the lower and upper disk steps
+        self._plane_at_step = self.pf.get_parallel_plane(self.xy(), self.STEP_HEIGHT)
+        self._plane_at_2step = self.pf.get_parallel_plane(
+            self.xy(), 2 * self.STEP_HEIGHT
+        )
+        # The circle cut and the sliding pin both start at the step
+        step_sketch = Sketch(self._plane_at_step)
+        self.add_circle_cut(step_sketch)
         self.add_turning_pin()
-        self.add_sliding_pin()
+        self.add_sliding_pin(step_sketch)
         self.paint("beige")
 
     def create_disk(self):
         """Profile then using lathe"""
 
         sketch = Sketch(self.yz())
-        pen = sketch.pencil
-
-        pen.line_to(0, BEARING_HEIGHT - BEARING_PLATE_OFFSET)
-        pen.line(BEARING_DIAMETER / 2, 0)
-        pen.line(0, -BEARING_HEIGHT + BEARING_PLATE_OFFSET)
-        pen.line_to(self.DISK_DIAMETER / 2, pen.y)
-        pen.line(0, self.STEP_HEIGHT)
-        pen.line_to((self.TOP_CIRCLE_DIAMETER - DISK_TOLERANCE) / 2, pen.y)
-        pen.line(0, self.STEP_HEIGHT)
-        pen.line_to(0, pen.y)
-
-        shape = pen.close()
+        bearing_top = BEARING_HEIGHT - BEARING_PLATE_OFFSET
+        top_radius = (self.TOP_CIRCLE_DIAMETER - DISK_TOLERANCE) / 2
+        profile = [
+            (0, 0),
+            (0, bearing_top),
+            (BEARING_DIAMETER / 2, bearing_top),
+            (BEARING_DIAMETER / 2, 0),
+            (self.DISK_DIAMETER / 2, 0),
+            (self.DISK_DIAMETER / 2, self.STEP_HEIGHT),
+            (top_radius, self.STEP_HEIGHT),
+            (top_radius, 2 * self.STEP_HEIGHT),
+            (0, 2 * self.STEP_HEIGHT),
+        ]
+        shape = Polygon.from_points([Point(sketch, *p) for p in profile])
         axis = Axis(Line(sketch.origin, Point(sketch, 0, 1)))
         lathe = Lathe(shape, axis)
 
         self.add_operation(lathe)
 
-    def add_circle_cut(self):
-        plane = self.pf.get_parallel_plane(self.xy(), self.STEP_HEIGHT)
-        cut_sketch = Sketch(plane)
+    def add_circle_cut(self, cut_sketch):
         shape = Circle(Point(cut_sketch, 0, self.CUT_OFFSET), self.CUT_DIAMETER / 2)
         cut_extrusion = Extrusion(shape, self.STEP_HEIGHT + self.LIP_HEIGHT, cut=True)
         self.add_operation(cut_extrusion)
 
     def add_turning_pin(self):
-        plane = self.pf.get_parallel_plane(self.xy(), 2 * self.STEP_HEIGHT)
-        sketch = Sketch(plane)
+        sketch = Sketch(self._plane_at_2step)
         pin_center = Point(sketch, 0.8 * (self.TOP_CIRCLE_DIAMETER / 2), 0)
         pin_circle = Circle(pin_center, PIN_DIAMETER / 2)
         pin = Extrusion(
@@ -228,10 +237,8 @@ class GenevaDiskAndHoles(Part):
         )
         self.add_operation(pin)
 
-    def add_sliding_pin(self):
-        plane = self.pf.get_parallel_plane(self.xy(), self.STEP_HEIGHT)
-        sketch = Sketch(plane)
-        pin_center = Point(sketch, 0, PIN_DISTANCE / math.sqrt(2))
+    def add_sliding_pin(self, sketch):
+        pin_center = Point(sketch, 0, _PIN_OVER_SQRT2)
         pin_circle = Circle(pin_center, PIN_DIAMETER / 2)
         pin = Extrusion(
             pin_circle,
@@ -242,6 +249,26 @@ class GenevaDiskAndHoles(Part):
         self.add_operation(pin)
 
 
+def slot_corners(n_slots, center_offset, slot_length, slot_width):
+    """Corners of n_slots rectangular slots evenly spread around the origin,
+    the first one at 180 / n_slots degrees. Returns an (n_slots, 4, 2) array."""
+    angles = (2 * np.arange(n_slots) + 1) * np.pi / n_slots
+    # (cos, sin) of each slot axis
+    axes = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    centers = axes * center_offset
+    len_vec = axes * (slot_length / 2)
+    wid_vec = axes[:, ::-1] * [1, -1] * (slot_width / 2)
+    return np.stack(
+        [
+            centers - len_vec + wid_vec,
+            centers - len_vec - wid_vec,
+            centers + len_vec - wid_vec,
+            centers + len_vec + wid_vec,
+        ],
+        axis=1,
+    )
+
+
 class GenevaDriveCrossSection(Part):
     WIDTH = SLIDING_CIRCLE_DIAMETER
     CUT_OFFSET = PIN_DISTANCE
@@ -253,61 +280,49 @@ class GenevaDriveCrossSection(Part):
     CROSS_WIDTH = 1 + BEARING_HEIGHT - BEARING_PLATE_OFFSET
 
     def __init__(self):
-        self.add_base_circle()
-        self.cut_4_circles()
-        self.cut_pin_slot()
-        self.cut_bearing_hole()
+        # Every profile of the cross lies on the XY plane
+        sketch = Sketch(self.xy())
+        self.add_base_circle(sketch)
+        self.cut_4_circles(sketch)
+        self.cut_pin_slot(sketch)
+        self.cut_bearing_hole(sketch)
         self.paint("brown")
 
-    def add_base_circle(self):
-        sketch = Sketch(self.xy())
+    def add_base_circle(self, sketch):
         base_circle = Circle(sketch.origin, self.WIDTH / 2)
         extrusion = Extrusion(base_circle, self.CROSS_WIDTH)
         self.add_operation(extrusion)
 
-    def cut_4_circles(self):
-        sketch = Sketch(self.xy())
+    def cut_4_circles(self, sketch):
         points = [
             (0, self.CUT_OFFSET),
             (0, -self.CUT_OFFSET),
             (self.CUT_OFFSET, 0),
             (-self.CUT_OFFSET, 0),
         ]
-        for p in points:
-            circle = Circle(Point(sketch, *p), self.CUT_RADIUS)
-            cut_extrusion = Extrusion(circle, self.CROSS_WIDTH, cut=True)
-            self.add_operation(cut_extrusion)
+        # All four circles share the sketch, so cut them in a single boolean
+        circles = [Circle(Point(sketch, *p), self.CUT_RADIUS) for p in points]
+        cut_extrusion = Extrusion(circles, self.CROSS_WIDTH, cut=True)
+        self.add_operation(cut_extrusion)
 
-    def cut_pin_slot(self):
-        sketch = Sketch(self.xy())
-        for i in range(4):
-            orientation = i * math.pi / 2 + math.pi / 4
-            px = math.cos(orientation) * self.CENTER_SLOT_OFFSET
-            py = math.sin(orientation) * self.CENTER_SLOT_OFFSET
-
-            dx_len = math.cos(orientation) * self.SLOT_LENGTH / 2
-            dy_len = math.sin(orientation) * self.SLOT_LENGTH / 2
-            dx_width = math.sin(orientation) * self.SLOT_WIDTH / 2
-            dy_width = -math.cos(orientation) * self.SLOT_WIDTH / 2
-            points = [
-                (px - dx_len + dx_width, py - dy_len + dy_width),
-                (px - dx_len - dx_width, py - dy_len - dy_width),
-                (px + dx_len - dx_width, py + dy_len - dy_width),
-                (px + dx_len + dx_width, py + dy_len + dy_width),
-            ]
-
-            lines = [
-                Line(Point(sketch, *p1), Point(sketch, *p2))
-                for p1, p2 in zip(points, points[1:])
-            ]
-
-            # slot_shape = RoundedCornerPolygon(lines, 2)
-            slot_shape = Polygon(lines)
-            slot_extrusion = Extrusion(slot_shape, self.CROSS_WIDTH, cut=True)
-            self.add_operation(slot_extrusion)
-
-    def cut_bearing_hole(self):
-        sketch = Sketch(self.xy())
+    def cut_pin_slot(self, sketch):
+        # One slot between each pair of the 4 circle cuts
+        corners = slot_corners(
+            4, self.CENTER_SLOT_OFFSET, self.SLOT_LENGTH, self.SLOT_WIDTH
+        )
+        slot_shapes = []
+        for slot in corners.tolist():
+            # One Point per corner, shared by the two edges meeting there.
+            # from_points also adds the closing edge back to the first corner
+            corner_points = [Point(sketch, *p) for p in slot]
+            slot_shape = Polygon.from_points(corner_points)
+            # slot_shape = RoundedCornerPolygon(slot_shape.lines, 2)
+            slot_shapes.append(slot_shape)
+
+        slot_extrusion = Extrusion(slot_shapes, self.CROSS_WIDTH, cut=True)
+        self.add_operation(slot_extrusion)
+
+    def cut_bearing_hole(self, sketch):
         bearing_hole = Circle(sketch.origin, BEARING_DIAMETER / 2)
         bearing_extrusion = Extrusion(bearing_hole, self.CROSS_WIDTH - 1, cut=True)
         self.add_operation(bearing_extrusion)
@@ -327,15 +342,13 @@ class GenevaDrive(Assembly):
     def add_geneva_disk_and_holes(self):
         disk = GenevaDiskAndHoles()
         disk_tf = TFHelper()
-        disk_tf.translate_z(CIRCLES_PART_HEIGHT)
-        disk_tf.translate_x(-PIN_DISTANCE / 2)
+        disk_tf.translate([-PIN_DISTANCE / 2, 0, CIRCLES_PART_HEIGHT])
         self.add_component(disk, disk_tf.get_tf())
 
     def add_geneva_drive_cross_section(self):
         cross_section = GenevaDriveCrossSection()
         cross_section_tf = TFHelper()
-        cross_section_tf.translate_z(CROSS_PART_HEIGHT)
-        cross_section_tf.translate_x(PIN_DISTANCE / 2)
+        cross_section_tf.translate([PIN_DISTANCE / 2, 0, CROSS_PART_HEIGHT])
         self.add_component(cross_section, cross_section_tf.get_tf())
 
 